@@ -1,22 +1,204 @@
 import aiosqlite
 import json
-from datetime import datetime
-from typing import Optional, Dict
+import time
+from typing import Optional, Dict, Tuple, Any, Iterable, AsyncIterator
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, closing
+import asyncio
+import os
 import sqlite3
+import weakref
+import zlib
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_STATUSES = ('COMPLETED', 'FAILED')
+
+# Columns update_process may set, in bit order. Every subset's UPDATE statement is
+# built once here so the write path only computes a mask and looks it up
+PROCESS_UPDATE_COLUMNS = ('status', 'result', 'error', 'chunk_count', 'processing_time', 'metadata', 'end_time')
+_UPDATE_PROCESS_SQL = {
+    mask: "UPDATE summary_processes SET {} WHERE meeting_id = ?".format(', '.join(
+        f"{column} = ?" for bit, column in enumerate(PROCESS_UPDATE_COLUMNS) if mask & (1 << bit)
+    ))
+    for mask in range(1, 1 << len(PROCESS_UPDATE_COLUMNS))
+}
+
+# Long text columns are stored zlib-compressed as BLOBs; shorter values stay plain
+# TEXT, and rows written before compression was introduced are read unchanged
+COMPRESS_MIN_LENGTH = 1024
+
+def _pack_text(text):
+    if text and len(text) >= COMPRESS_MIN_LENGTH:
+        return zlib.compress(text.encode("utf-8"))
+    return text
+
+def _unpack_text(value):
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+# Rows fetched per hop to the aiosqlite thread when iterating a cursor (sqlite3 defaults to 1)
+FETCH_BATCH_SIZE = 256
+
+_now_cache = (0, "")
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO string, formatted at most once per second"""
+    global _now_cache
+    second = int(time.time())
+    if second != _now_cache[0]:
+        _now_cache = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+    return _now_cache[1]
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+    _loads = orjson.loads
+except ImportError:  # orjson is optional, fall back to the stdlib codec
+    _dumps = json.dumps
+    _loads = json.loads
+
+class AioSqlitePool:
+    """Long-lived aiosqlite connections: one serialized writer plus a queue of readers"""
+    def __init__(self, db_path: str, configure, checkpoint_interval: float, readers: int = 3):
+        self.db_path = db_path
+        self._configure = configure
+        self._checkpoint_interval = checkpoint_interval
+        self._readers = readers
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._read_queue: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+        self._started = asyncio.ensure_future(self._open())
+        self._checkpoint_task = asyncio.ensure_future(self._checkpoint_loop())
+
+    async def _connect(self, read_only: bool = False) -> aiosqlite.Connection:
+        if read_only:
+            # WAL readers never take the write lock; mode=ro and query_only make that explicit
+            conn = aiosqlite.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            conn = aiosqlite.connect(self.db_path)
+        # Each connection runs on its own thread, started when it is awaited. As a
+        # daemon it cannot keep the interpreter alive if close() is never reached;
+        # SQLite recovers the WAL of a connection that was not closed on next open
+        conn.daemon = True
+        await conn
+        await self._configure(conn)
+        if read_only:
+            await conn.execute("PRAGMA query_only=1")
+        return conn
+
+    async def _open(self):
+        # The writer opens first so the -wal/-shm files exist for the read-only connections
+        self._writer = await self._connect()
+        for _ in range(self._readers):
+            self._read_queue.put_nowait(await self._connect(read_only=True))
+        logger.info(f"Opened SQLite pool for {self.db_path} (1 writer, {self._readers} readers)")
+
+    async def _checkpoint_loop(self):
+        """Periodically checkpoint and truncate the WAL off the request path"""
+        while True:
+            await asyncio.sleep(self._checkpoint_interval)
+            try:
+                async with self.writer() as conn:
+                    await conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except Exception as e:
+                logger.error(f"Error checkpointing WAL: {str(e)}", exc_info=True)
+
+    @asynccontextmanager
+    async def writer(self):
+        """Exclusive access to the writer connection"""
+        await self._started
+        async with self._write_lock:
+            try:
+                yield self._writer
+            finally:
+                # Never hand over a connection with a half-finished transaction
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+
+    @asynccontextmanager
+    async def reader(self):
+        """Borrow a reader connection from the queue"""
+        await self._started
+        conn = await self._read_queue.get()
+        try:
+            yield conn
+        finally:
+            self._read_queue.put_nowait(conn)
+
+    async def close(self):
+        """Close every connection opened by the pool once in-flight reads and writes finish"""
+        self._checkpoint_task.cancel()
+        try:
+            await self._checkpoint_task
+        except asyncio.CancelledError:
+            pass
+        readers = self._readers
+        try:
+            await self._started
+        except Exception as e:
+            # _open failed partway; close only the connections it did open
+            logger.warning(f"SQLite pool for {self.db_path} failed to open: {str(e)}")
+            readers = self._read_queue.qsize()
+        async with self._write_lock:
+            # Readers close first: only a read-write connection can checkpoint and
+            # remove the -wal/-shm files when it is the last one to close
+            for _ in range(readers):
+                conn = await self._read_queue.get()
+                await conn.close()
+            if self._writer is not None:
+                await self._writer.close()
+
 class DatabaseManager:
+    # Instances whose queued progress updates close_all flushes before closing the pools
+    _instances = weakref.WeakSet()
+    # One pool per database file, shared by every manager of that file so there
+    # is a single writer connection and one set of warm readers per file
+    _pools: Dict[str, AioSqlitePool] = {}
+    # Non-terminal update_process calls are coalesced and written at most this often
+    PROGRESS_FLUSH_INTERVAL = 0.02
+    # Commits never checkpoint inline; a background task truncates the WAL this often
+    WAL_CHECKPOINT_INTERVAL = 10.0
+    PAGE_SIZE = 8192
+    # summary_cache keeps at most this many rows, evicting the least recently
+    # used first, and drops rows unused for longer than the max age
+    SUMMARY_CACHE_MAX_ROWS = 10000
+    SUMMARY_CACHE_MAX_AGE = 30 * 24 * 3600
+    # A cache hit refreshes last_used at most this often, so hits rarely write
+    SUMMARY_CACHE_TOUCH_INTERVAL = 3600
+
     def __init__(self, db_path: str = "meeting_minutes.db"):
         self.db_path = db_path
+        # meeting_id -> column -> value of progress updates not yet written
+        self._pending_updates: Dict[str, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
         self._init_db()
+        DatabaseManager._instances.add(self)
 
     def _init_db(self):
         """Initialize the database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        # closing(): the connection's own context manager only commits, and a
+        # leftover read-write connection would keep the -wal/-shm files after shutdown
+        with closing(sqlite3.connect(self.db_path)) as conn:
             cursor = conn.cursor()
+
+            # Larger pages keep long transcript rows out of overflow pages. The page
+            # size of an existing file only changes through VACUUM, which cannot
+            # resize pages while in WAL mode, so drop out of WAL first
+            page_size = cursor.execute("PRAGMA page_size").fetchone()[0]
+            if page_size < self.PAGE_SIZE:
+                cursor.execute("PRAGMA journal_mode=DELETE")
+                cursor.execute(f"PRAGMA page_size={self.PAGE_SIZE}")
+                cursor.execute("VACUUM")
+                logger.info(f"Changed SQLite page size from {page_size} to {self.PAGE_SIZE}")
+
+            # WAL is persistent per database file, so it only needs to be set once
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
             
             # Create meetings table
             cursor.execute("""
@@ -88,39 +270,122 @@ class DatabaseManager:
                 )
             """)
 
+            # Chunk summaries keyed by a hash of the model and chunk text, so
+            # re-processing a transcript does not pay for the LLM calls again
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS summary_cache (
+                    key TEXT PRIMARY KEY,
+                    json TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    last_used INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            cache_columns = {row[1] for row in cursor.execute("PRAGMA table_info(summary_cache)")}
+            if "last_used" not in cache_columns:
+                cursor.execute("ALTER TABLE summary_cache ADD COLUMN last_used INTEGER NOT NULL DEFAULT 0")
+                cursor.execute("UPDATE summary_cache SET last_used = created_at")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_summary_cache_last_used ON summary_cache(last_used)")
+
+            # Indexes for the hot lookups: transcripts by meeting (the index also
+            # holds the rowid, so listing segments in insertion order needs no
+            # sort), meetings listed newest first, and the id-or-title duplicate
+            # check in save_meeting
+            cursor.execute("DROP INDEX IF EXISTS idx_transcripts_meeting_id_timestamp")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transcripts_meeting_id ON transcripts(meeting_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_created_at ON meetings(created_at DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_title ON meetings(title)")
+
+            # Results used to be JSON-encoded twice (a JSON string holding the JSON
+            # object); unwrap those rows so readers only ever decode once
+            cursor.execute("SELECT meeting_id, result FROM summary_processes WHERE result LIKE '\"%'")
+            for meeting_id, result in cursor.fetchall():
+                try:
+                    unwrapped = json.loads(result)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(unwrapped, str):
+                    cursor.execute("UPDATE summary_processes SET result = ? WHERE meeting_id = ?", (unwrapped, meeting_id))
+
             conn.commit()
 
+    @staticmethod
+    async def _configure_connection(conn: aiosqlite.Connection):
+        """Apply per-connection PRAGMAs (journal mode is set once in _init_db)"""
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        await conn.execute("PRAGMA cache_size=-64000")
+        await conn.execute("PRAGMA mmap_size=268435456")
+        await conn.execute("PRAGMA busy_timeout=5000")
+        await conn.execute("PRAGMA wal_autocheckpoint=0")
+
+    def _get_pool(self) -> AioSqlitePool:
+        # Created lazily so the connections belong to the running event loop
+        key = os.path.abspath(self.db_path)
+        pool = DatabaseManager._pools.get(key)
+        if pool is None:
+            pool = AioSqlitePool(self.db_path, self._configure_connection, self.WAL_CHECKPOINT_INTERVAL)
+            DatabaseManager._pools[key] = pool
+        return pool
+
     @asynccontextmanager
     async def _get_connection(self):
-        """Get a new database connection"""
-        conn = await aiosqlite.connect(self.db_path)
-        try:
+        """Get the pooled writer connection"""
+        async with self._get_pool().writer() as conn:
             yield conn
-        finally:
-            await conn.close()
+
+    @asynccontextmanager
+    async def _get_read_connection(self):
+        """Get a pooled connection for read-only queries"""
+        async with self._get_pool().reader() as conn:
+            yield conn
+
+    async def _flush_pending(self):
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        if self._pending_updates:
+            await self.flush_process_updates()
+
+    async def close(self):
+        """Flush queued progress updates and close the pool shared by this database file"""
+        await self._flush_pending()
+        pool = DatabaseManager._pools.pop(os.path.abspath(self.db_path), None)
+        if pool is not None:
+            await pool.close()
+
+    @classmethod
+    async def close_all(cls):
+        """Flush every DatabaseManager instance and close all pools"""
+        for manager in list(cls._instances):
+            await manager._flush_pending()
+        pools, cls._pools = list(cls._pools.values()), {}
+        for pool in pools:
+            try:
+                await pool.close()
+            except Exception as e:
+                logger.error(f"Error closing SQLite pool for {pool.db_path}: {str(e)}", exc_info=True)
 
     async def create_process(self, meeting_id: str) -> str:
         """Create a new process entry or update existing one and return its ID"""
-        now = datetime.utcnow().isoformat()
+        now = _utc_now_iso()
         
         async with self._get_connection() as conn:
-            # First try to update existing process
+            # Progress queued for a previous run must not overwrite the reset below
+            self._pending_updates.pop(meeting_id, None)
+            # Single UPSERT keyed on meeting_id resets an existing process in place
             await conn.execute(
                 """
-                UPDATE summary_processes 
-                SET status = ?, updated_at = ?, start_time = ?, error = NULL, result = NULL
-                WHERE meeting_id = ?
+                INSERT INTO summary_processes (meeting_id, status, created_at, updated_at, start_time)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(meeting_id) DO UPDATE SET
+                    status = excluded.status,
+                    updated_at = excluded.updated_at,
+                    start_time = excluded.start_time,
+                    error = NULL,
+                    result = NULL
                 """,
-                ("PENDING", now, now, meeting_id)
+                (meeting_id, "PENDING", now, now, now)
             )
-            
-            # If no rows were updated, insert a new one
-            if conn.total_changes == 0:
-                await conn.execute(
-                    "INSERT INTO summary_processes (meeting_id, status, created_at, updated_at, start_time) VALUES (?, ?, ?, ?, ?)",
-                    (meeting_id, "PENDING", now, now, now)
-                )
-            
             await conn.commit()
         
         return meeting_id
@@ -128,112 +393,190 @@ class DatabaseManager:
     async def update_process(self, meeting_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None, 
                            chunk_count: Optional[int] = None, processing_time: Optional[float] = None, 
                            metadata: Optional[Dict] = None):
-        """Update a process status and result"""
-        now = datetime.utcnow().isoformat()
-        
+        """Update a process status and result.
+
+        Terminal statuses are written immediately; anything else is queued and
+        coalesced with other progress updates into one periodic commit.
+        """
+        now = _utc_now_iso()
+        terminal = status.upper() in TERMINAL_STATUSES
+
+        fields: Dict[str, Any] = {"status": status}
+        if result:
+            fields["result"] = _dumps(result)
+        if error:
+            fields["error"] = error
+        if chunk_count is not None:
+            fields["chunk_count"] = chunk_count
+        if processing_time is not None:
+            fields["processing_time"] = processing_time
+        if metadata:
+            fields["metadata"] = _dumps(metadata)
+        if terminal:
+            fields["end_time"] = now
+
+        if not terminal:
+            self._pending_updates.setdefault(meeting_id, {}).update(fields)
+            self._schedule_flush()
+            return
+
         async with self._get_connection() as conn:
-            update_fields = ["status = ?"]
-            params = [status]
-            
-            if result:
-                update_fields.append("result = ?")
-                params.append(json.dumps(result))
-            if error:
-                update_fields.append("error = ?")
-                params.append(error)
-            if chunk_count is not None:
-                update_fields.append("chunk_count = ?")
-                params.append(chunk_count)
-            if processing_time is not None:
-                update_fields.append("processing_time = ?")
-                params.append(processing_time)
-            if metadata:
-                update_fields.append("metadata = ?")
-                params.append(json.dumps(metadata))
-            if status == 'COMPLETED' or status == 'FAILED':
-                update_fields.append("end_time = ?")
-                params.append(now)
-                
-            params.append(meeting_id)
-            query = f"UPDATE summary_processes SET {', '.join(update_fields)} WHERE meeting_id = ?"
-            await conn.execute(query, params)
+            await self._write_final_update(conn, meeting_id, fields)
+            await conn.commit()
+
+    async def finalize_process(self, meeting_id: str, result: Dict, meeting_name: Optional[str] = None):
+        """Complete a process and rename its meeting in a single transaction"""
+        now = _utc_now_iso()
+        fields = {
+            "status": "completed",
+            "result": _dumps(result),
+            "end_time": now,
+        }
+        async with self._get_connection() as conn:
+            await self._write_final_update(conn, meeting_id, fields)
+            if meeting_name:
+                await self._rename_meeting(conn, meeting_id, meeting_name, now)
+            await conn.commit()
+
+    async def _write_final_update(self, conn, meeting_id: str, fields: Dict[str, Any]):
+        """Write a terminal process update on the writer connection without committing"""
+        # Fold in any queued progress so it cannot land after the final status
+        pending = self._pending_updates.pop(meeting_id, None)
+        if pending:
+            fields = {**pending, **fields}
+        mask, params = self._process_update_params(fields)
+        params.append(meeting_id)
+        await conn.execute(_UPDATE_PROCESS_SQL[mask], params)
+
+    @staticmethod
+    def _process_update_params(fields: Dict[str, Any]) -> Tuple[int, list]:
+        """Column mask and parameters in PROCESS_UPDATE_COLUMNS order"""
+        mask = 0
+        params = []
+        for bit, column in enumerate(PROCESS_UPDATE_COLUMNS):
+            if column in fields:
+                mask |= 1 << bit
+                params.append(fields[column])
+        return mask, params
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_after_delay())
+
+    async def _flush_after_delay(self):
+        await asyncio.sleep(self.PROGRESS_FLUSH_INTERVAL)
+        try:
+            await self.flush_process_updates()
+        except Exception as e:
+            logger.error(f"Error flushing process updates: {str(e)}", exc_info=True)
+
+    async def flush_process_updates(self):
+        """Write all queued progress updates in a single transaction"""
+        async with self._get_connection() as conn:
+            # Taken under the writer lock so a terminal update cannot interleave
+            if not self._pending_updates:
+                return
+            pending, self._pending_updates = self._pending_updates, {}
+
+            # Group by column set so each shape is one executemany
+            batches: Dict[int, list] = {}
+            for meeting_id, fields in pending.items():
+                mask, params = self._process_update_params(fields)
+                params.append(meeting_id)
+                batches.setdefault(mask, []).append(params)
+            for mask, rows in batches.items():
+                await conn.executemany(_UPDATE_PROCESS_SQL[mask], rows)
             await conn.commit()
 
     async def save_transcript(self, meeting_id: str, transcript_text: str, model: str, model_name: str, 
                             chunk_size: int, overlap: int):
         """Save transcript data"""
-        now = datetime.utcnow().isoformat()
+        now = _utc_now_iso()
         async with self._get_connection() as conn:
-            # First try to update existing transcript
             await conn.execute("""
-                UPDATE transcript_chunks 
-                SET transcript_text = ?, model = ?, model_name = ?, chunk_size = ?, overlap = ?, created_at = ?
-                WHERE meeting_id = ?
-            """, (transcript_text, model, model_name, chunk_size, overlap, now, meeting_id))
-            
-            # If no rows were updated, insert a new one
-            if conn.total_changes == 0:
-                await conn.execute("""
-                    INSERT INTO transcript_chunks (meeting_id, transcript_text, model, model_name, chunk_size, overlap, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (meeting_id, transcript_text, model, model_name, chunk_size, overlap, now))
-            
+                INSERT INTO transcript_chunks (meeting_id, transcript_text, model, model_name, chunk_size, overlap, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(meeting_id) DO UPDATE SET
+                    transcript_text = excluded.transcript_text,
+                    model = excluded.model,
+                    model_name = excluded.model_name,
+                    chunk_size = excluded.chunk_size,
+                    overlap = excluded.overlap,
+                    created_at = excluded.created_at
+            """, (meeting_id, _pack_text(transcript_text), model, model_name, chunk_size, overlap, now))
             await conn.commit()
 
     async def update_meeting_name(self, meeting_id: str, meeting_name: str):
         """Update meeting name in both meetings and transcript_chunks tables"""
-        now = datetime.utcnow().isoformat()
+        now = _utc_now_iso()
         async with self._get_connection() as conn:
-            # Update meetings table
-            await conn.execute("""
-                UPDATE meetings
-                SET title = ?, updated_at = ?
-                WHERE id = ?
-            """, (meeting_name, now, meeting_id))
-            
-            # Update transcript_chunks table
-            await conn.execute("""
-                UPDATE transcript_chunks
-                SET meeting_name = ?
-                WHERE meeting_id = ?
-            """, (meeting_name, meeting_id))
-            
+            await self._rename_meeting(conn, meeting_id, meeting_name, now)
             await conn.commit()
 
+    @staticmethod
+    async def _rename_meeting(conn, meeting_id: str, meeting_name: str, now: str):
+        """Set the meeting name on meetings and transcript_chunks without committing"""
+        # Update meetings table
+        await conn.execute("""
+            UPDATE meetings
+            SET title = ?, updated_at = ?
+            WHERE id = ?
+        """, (meeting_name, now, meeting_id))
+
+        # Update transcript_chunks table
+        await conn.execute("""
+            UPDATE transcript_chunks
+            SET meeting_name = ?
+            WHERE meeting_id = ?
+        """, (meeting_name, meeting_id))
+
     async def get_transcript_data(self, meeting_id: str):
         """Get transcript data for a meeting"""
-        async with self._get_connection() as conn:
+        async with self._get_read_connection() as conn:
             async with conn.execute("""
-                SELECT t.*, p.status, p.result 
+                SELECT t.*, p.status, p.result, p.error, p.chunk_count, p.metadata
                 FROM transcript_chunks t 
                 JOIN summary_processes p ON t.meeting_id = p.meeting_id 
                 WHERE t.meeting_id = ?
             """, (meeting_id,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    return dict(zip([col[0] for col in cursor.description], row))
+                    data = dict(row)
+                    data["transcript_text"] = _unpack_text(data["transcript_text"])
+                    return data
                 return None
 
+    @staticmethod
+    async def _insert_meeting(conn: aiosqlite.Connection, meeting_id: str, title: str):
+        # Insert only if no meeting shares this id or title
+        cursor = await conn.execute("""
+            INSERT INTO meetings (id, title, created_at, updated_at)
+            SELECT ?, ?, datetime('now'), datetime('now')
+            WHERE NOT EXISTS (SELECT 1 FROM meetings WHERE id = ? OR title = ?)
+        """, (meeting_id, title, meeting_id, title))
+        
+        if cursor.rowcount == 0:
+            # If we get here and meeting exists, throw error since we don't want duplicates
+            raise Exception(f"Meeting with ID {meeting_id} already exists")
+
+    @staticmethod
+    async def _insert_transcripts(conn: aiosqlite.Connection, rows: Iterable[Tuple[str, str, str, str, str, str]]):
+        await conn.executemany("""
+            INSERT INTO transcripts (
+                meeting_id, transcript, timestamp, summary, action_items, key_points
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            (meeting_id, _pack_text(transcript), timestamp, _pack_text(summary),
+             _pack_text(action_items), _pack_text(key_points))
+            for meeting_id, transcript, timestamp, summary, action_items, key_points in rows
+        ))
+
     async def save_meeting(self, meeting_id: str, title: str):
         """Save or update a meeting"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Check if meeting exists
-                cursor.execute("SELECT id FROM meetings WHERE id = ? OR title = ?", (meeting_id, title))
-                existing_meeting = cursor.fetchone()
-                
-                if not existing_meeting:
-                    # Create new meeting
-                    cursor.execute("""
-                        INSERT INTO meetings (id, title, created_at, updated_at)
-                        VALUES (?, ?, datetime('now'), datetime('now'))
-                    """, (meeting_id, title))
-                else:
-                    # If we get here and meeting exists, throw error since we don't want duplicates
-                    raise Exception(f"Meeting with ID {meeting_id} already exists")
-                conn.commit()
+            async with self._get_connection() as conn:
+                await self._insert_meeting(conn, meeting_id, title)
+                await conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error saving meeting: {str(e)}")
@@ -242,63 +585,70 @@ class DatabaseManager:
     async def save_meeting_transcript(self, meeting_id: str, transcript: str, timestamp: str, summary: str = "", action_items: str = "", key_points: str = ""):
         """Save a transcript for a meeting"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Save transcript
-                cursor.execute("""
-                    INSERT INTO transcripts (
-                        meeting_id, transcript, timestamp, summary, action_items, key_points
-                    ) VALUES (?, ?, ?, ?, ?, ?)
-                """, (meeting_id, transcript, timestamp, summary, action_items, key_points))
-                
-                conn.commit()
+            async with self._get_connection() as conn:
+                await self._insert_transcripts(conn, [(meeting_id, transcript, timestamp, summary, action_items, key_points)])
+                await conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error saving transcript: {str(e)}")
             raise
 
+    async def save_meeting_with_transcripts(self, meeting_id: str, title: str, rows: Iterable[Tuple[str, str, str, str, str]]):
+        """Create a meeting and its transcripts atomically.
+
+        Each row is (transcript, timestamp, summary, action_items, key_points).
+        """
+        try:
+            async with self._get_connection() as conn:
+                await conn.execute("BEGIN IMMEDIATE")
+                await self._insert_meeting(conn, meeting_id, title)
+                await self._insert_transcripts(conn, ((meeting_id, *row) for row in rows))
+                await conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error saving meeting with transcripts: {str(e)}")
+            raise
+
     async def get_meeting(self, meeting_id: str):
         """Get a meeting by ID with all its transcripts"""
         try:
-            async with self._get_connection() as conn:
-                # Get meeting details
+            async with self._get_read_connection() as conn:
+                # Meeting details and its transcripts in one statement; the meeting
+                # columns repeat on every row and a meeting without transcripts
+                # yields a single row with NULL transcript columns
                 cursor = await conn.execute("""
-                    SELECT id, title, created_at, updated_at
-                    FROM meetings
-                    WHERE id = ?
+                    SELECT m.id, m.title, m.created_at, m.updated_at, t.transcript, t.timestamp
+                    FROM meetings m
+                    LEFT JOIN transcripts t ON t.meeting_id = m.id
+                    WHERE m.id = ?
+                    ORDER BY t.rowid
                 """, (meeting_id,))
-                meeting = await cursor.fetchone()
-                
-                if not meeting:
-                    return None
-                
-                # Get all transcripts for this meeting
-                cursor = await conn.execute("""
-                    SELECT transcript, timestamp
-                    FROM transcripts
-                    WHERE meeting_id = ?
-                """, (meeting_id,))
-                transcripts = await cursor.fetchall()
-                
-                return {
-                    'id': meeting[0],
-                    'title': meeting[1],
-                    'created_at': meeting[2],
-                    'updated_at': meeting[3],
-                    'transcripts': [{
-                        'id': meeting_id,
-                        'text': transcript[0],
-                        'timestamp': transcript[1]
-                    } for transcript in transcripts]
-                }
+                cursor.arraysize = FETCH_BATCH_SIZE
+
+                meeting = None
+                async for row in cursor:
+                    if meeting is None:
+                        meeting = {
+                            'id': row[0],
+                            'title': row[1],
+                            'created_at': row[2],
+                            'updated_at': row[3],
+                            'transcripts': []
+                        }
+                    if row[4] is not None:
+                        meeting['transcripts'].append({
+                            'id': meeting_id,
+                            'text': _unpack_text(row[4]),
+                            'timestamp': row[5]
+                        })
+                return meeting
         except Exception as e:
             logger.error(f"Error getting meeting: {str(e)}")
             raise
 
     async def update_meeting_title(self, meeting_id: str, new_title: str):
         """Update a meeting's title"""
-        now = datetime.utcnow().isoformat()
+        now = _utc_now_iso()
         async with self._get_connection() as conn:
             await conn.execute("""
                 UPDATE meetings
@@ -307,20 +657,25 @@ class DatabaseManager:
             """, (new_title, now, meeting_id))
             await conn.commit()
 
-    async def get_all_meetings(self):
-        """Get all meetings with basic information"""
-        async with self._get_connection() as conn:
-            cursor = await conn.execute("""
+    async def iter_meetings(self) -> AsyncIterator[Dict[str, str]]:
+        """Yield meetings newest first without materializing the full result set"""
+        async with self._get_read_connection() as conn:
+            async with conn.execute("""
                 SELECT id, title, created_at
                 FROM meetings
                 ORDER BY created_at DESC
-            """)
-            rows = await cursor.fetchall()
-            return [{
-                'id': row[0],
-                'title': row[1],
-                'created_at': row[2]
-            } for row in rows]
+            """) as cursor:
+                cursor.arraysize = FETCH_BATCH_SIZE
+                async for row in cursor:
+                    yield {
+                        'id': row[0],
+                        'title': row[1],
+                        'created_at': row[2]
+                    }
+
+    async def get_all_meetings(self):
+        """Get all meetings with basic information"""
+        return [meeting async for meeting in self.iter_meetings()]
 
     async def delete_meeting(self, meeting_id: str):
         """Delete a meeting and all its associated data"""
@@ -346,10 +701,10 @@ class DatabaseManager:
 
     async def get_model_config(self):
         """Get the current model configuration"""
-        async with self._get_connection() as conn:
+        async with self._get_read_connection() as conn:
             cursor = await conn.execute("SELECT provider, model, whisperModel FROM settings")
             row = await cursor.fetchone()
-            return dict(zip([col[0] for col in cursor.description], row)) if row else None
+            return dict(row) if row else None
 
     async def save_model_config(self, provider: str, model: str, whisperModel: str):
         """Save the model configuration"""
@@ -392,7 +747,7 @@ class DatabaseManager:
         if provider not in provider_list:
             raise ValueError(f"Invalid provider: {provider}")
 
-        async with self._get_connection() as conn:
+        async with self._get_read_connection() as conn:
             if provider == "openai":
                 cursor = await conn.execute("SELECT openaiApiKey FROM settings WHERE id = '1'")
             elif provider == "claude":
@@ -423,3 +778,33 @@ class DatabaseManager:
             
    
 
+    async def get_cached_summary(self, key: str) -> Any:
+        """Cached summary for a chunk hash, decoded, or None"""
+        async with self._get_read_connection() as conn:
+            async with conn.execute("SELECT json, last_used FROM summary_cache WHERE key = ?", (key,)) as cursor:
+                row = await cursor.fetchone()
+        if not row:
+            return None
+        now = int(time.time())
+        if now - row[1] >= self.SUMMARY_CACHE_TOUCH_INTERVAL:
+            async with self._get_connection() as conn:
+                await conn.execute("UPDATE summary_cache SET last_used = ? WHERE key = ?", (now, key))
+                await conn.commit()
+        return _loads(_unpack_text(row[0]))
+
+    async def cache_summary(self, key: str, summary: Any):
+        """Store a JSON-compatible summary for a chunk hash, evicting expired and least recently used rows"""
+        now = int(time.time())
+        async with self._get_connection() as conn:
+            await conn.execute(
+                "INSERT OR REPLACE INTO summary_cache (key, json, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, _pack_text(_dumps(summary)), now, now),
+            )
+            await conn.execute("DELETE FROM summary_cache WHERE last_used < ?", (now - self.SUMMARY_CACHE_MAX_AGE,))
+            # Walks the last_used index past the newest rows; only the overflow is deleted
+            await conn.execute("""
+                DELETE FROM summary_cache WHERE key IN (
+                    SELECT key FROM summary_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.SUMMARY_CACHE_MAX_ROWS,))
+            await conn.commit()
@@ -1,18 +1,32 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, model_validator
 import uvicorn
-from typing import Optional, List
+from typing import Dict, Optional, List
 import logging
 from dotenv import load_dotenv
 from db import DatabaseManager
+import asyncio
+import itertools
 import json
 from threading import Lock
 from transcript_processor import TranscriptProcessor
 import time
 import os
 
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+    json_loads = orjson.loads
+    json_dumps_bytes = orjson.dumps
+except ImportError:  # orjson is optional, fall back to the stdlib codec
+    FastJSONResponse = JSONResponse
+    json_loads = json.loads
+
+    def json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
 # Load environment variables
 load_dotenv()
 
@@ -21,7 +35,6 @@ logger = logging.getLogger(__name__)
 # Use LOG_LEVEL env var (default to INFO)
 log_level_name = os.getenv("LOG_LEVEL", "INFO").upper()
 log_level = getattr(logging, log_level_name, logging.INFO)
-logger.setLevel(log_level)
 
 # Create console handler with formatting
 console_handler = logging.StreamHandler()
@@ -34,14 +47,20 @@ formatter = logging.Formatter(
 )
 console_handler.setFormatter(formatter)
 
-# Add handler to logger if not already added
-if not logger.handlers:
-    logger.addHandler(console_handler)
+# Add handler to the app's loggers if not already added; the root logger is
+# left alone so library loggers keep their own (quieter) defaults
+for app_logger in (logger, logging.getLogger("transcript_processor"), logging.getLogger("db")):
+    app_logger.setLevel(log_level)
+    if not app_logger.handlers:
+        app_logger.addHandler(console_handler)
+    # Records are already emitted by our own handler, don't repeat them on the root logger
+    app_logger.propagate = False
 
 app = FastAPI(
     title="Meeting Summarizer API",
     description="API for processing and summarizing meeting transcripts",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS using env var ALLOWED_ORIGINS (comma-separated)
@@ -93,15 +112,27 @@ class SaveModelConfigRequest(BaseModel):
     whisperModel: str
     apiKey: Optional[str] = None
 
+# Longest transcript accepted for summarization, in characters
+MAX_TRANSCRIPT_LENGTH = 5_000_000
+
 class TranscriptRequest(BaseModel):
     """Request model for transcript text, updated with meeting_id"""
-    text: str
+    text: str = Field(min_length=1, max_length=MAX_TRANSCRIPT_LENGTH)
     model: str
     model_name: str
     meeting_id: str
     chunk_size: Optional[int] = 5000
     overlap: Optional[int] = 1000
 
+    @model_validator(mode="after")
+    def check_chunking(self):
+        """Reject chunking parameters that cannot split the transcript"""
+        if self.chunk_size is None or self.chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if self.overlap is None or not 0 <= self.overlap < self.chunk_size:
+            raise ValueError("overlap must be non-negative and less than chunk_size")
+        return self
+
 class SummaryProcessor:
     """Handles the processing of summaries in a thread-safe way"""
     def __init__(self):
@@ -115,34 +146,20 @@ class SummaryProcessor:
             logger.error(f"Failed to initialize SummaryProcessor: {str(e)}", exc_info=True)
             raise
 
-    async def process_transcript(self, text: str, model: str, model_name: str, chunk_size: int = 5000, overlap: int = 1000) -> tuple:
-        """Process a transcript text"""
+    async def process_transcript(self, text: str, model: str, model_name: str, chunk_size: int = 5000, overlap: int = 1000,
+                                 on_chunk=None) -> tuple:
+        """Process a transcript text; inputs are validated by TranscriptRequest"""
         try:
-            if not text:
-                raise ValueError("Empty transcript text provided")
-
-            # Validate chunk_size and overlap
-            if chunk_size <= 0:
-                raise ValueError("chunk_size must be positive")
-            if overlap < 0:
-                raise ValueError("overlap must be non-negative")
-            if overlap >= chunk_size:
-                overlap = chunk_size - 1  # Ensure overlap is less than chunk_size
-
-            # Ensure step size is positive
-            step_size = chunk_size - overlap
-            if step_size <= 0:
-                chunk_size = overlap + 1  # Adjust chunk_size to ensure positive step
-
-            logger.info(f"Processing transcript of length {len(text)} with chunk_size={chunk_size}, overlap={overlap}")
+            logger.info("Processing transcript of length %d with chunk_size=%d, overlap=%d", len(text), chunk_size, overlap)
             num_chunks, all_json_data = await self.transcript_processor.process_transcript(
                 text=text,
                 model=model,
                 model_name=model_name,
                 chunk_size=chunk_size,
-                overlap=overlap
+                overlap=overlap,
+                on_chunk=on_chunk
             )
-            logger.info(f"Successfully processed transcript into {num_chunks} chunks")
+            logger.info("Successfully processed transcript into %d chunks", num_chunks)
 
             return num_chunks, all_json_data
         except Exception as e:
@@ -162,13 +179,117 @@ class SummaryProcessor:
 # Initialize processor
 processor = SummaryProcessor()
 
+# Sections of a chunk summary whose blocks are merged into the final summary,
+# in output order, with their display titles
+SECTION_TITLES = {
+    "SectionSummary": "Section Summary",
+    "CriticalDeadlines": "Critical Deadlines",
+    "KeyItemsDecisions": "Key Items & Decisions",
+    "ImmediateActionItems": "Immediate Action Items",
+    "NextSteps": "Next Steps",
+    "OtherImportantPoints": "Other Important Points",
+    "ClosingRemarks": "Closing Remarks",
+}
+SECTION_KEYS = frozenset(SECTION_TITLES)
+
+def new_final_summary() -> dict:
+    """Empty final summary skeleton with fresh block lists"""
+    summary = {"MeetingName": ""}
+    for key, title in SECTION_TITLES.items():
+        summary[key] = {"title": title, "blocks": []}
+    return summary
+
+def read_chunks_total(metadata) -> Optional[int]:
+    """Total chunk count recorded in a process's metadata JSON, if known"""
+    if not metadata:
+        return None
+    try:
+        return json_loads(metadata).get("chunks_total")
+    except (ValueError, AttributeError):
+        return None
+
+def parse_chunk_summary(process_id: str, chunk_summary: dict) -> tuple:
+    """MeetingName and per-section block lists of one chunk summary"""
+    meeting_name = ""
+    sections = {}
+    try:
+        for key, value in chunk_summary.items():
+            if key in SECTION_KEYS:
+                blocks = value.get("blocks") if isinstance(value, dict) else None
+                if isinstance(blocks, list):
+                    sections[key] = blocks
+            elif key == "MeetingName" and value:
+                meeting_name = value
+    except Exception as e:
+        logger.error("Error processing chunk data for %s: %s. Chunk: %.100s...", process_id, e, chunk_summary)
+    return meeting_name, sections
+
+def build_final_summary(parsed_chunks) -> dict:
+    """Merge parsed chunk summaries, in order, into the final summary structure"""
+    final_summary = new_final_summary()
+    # Block lists per section, flattened once after all chunks are read
+    section_parts = {key: [] for key in SECTION_KEYS}
+    for meeting_name, sections in parsed_chunks:
+        if meeting_name:
+            final_summary["MeetingName"] = meeting_name
+        for key, blocks in sections.items():
+            section_parts[key].append(blocks)
+
+    for key, parts in section_parts.items():
+        final_summary[key]["blocks"] = list(itertools.chain.from_iterable(parts))
+    return final_summary
+
+# Seconds between SSE comment lines that keep idle /events connections open through proxies
+SSE_KEEPALIVE_SECONDS = 15.0
+
+class ProcessEvents:
+    """In-process fan-out of summary progress to /events subscribers"""
+    def __init__(self):
+        self._subscribers: Dict[str, set] = {}
+
+    def subscribe(self, process_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(process_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, process_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(process_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[process_id]
+
+    def has_subscribers(self, process_id: str) -> bool:
+        return process_id in self._subscribers
+
+    def publish(self, process_id: str, event: str, data: str):
+        """Queue one SSE event for every current subscriber; data must be a single line"""
+        message = f"event: {event}\ndata: {data}\n\n"
+        for queue in self._subscribers.get(process_id, ()):
+            queue.put_nowait(message)
+
+process_events = ProcessEvents()
+
+# Progress of in-flight processes by process id: parsed chunk summaries keyed
+# by chunk index plus the chunk total; /get-summary merges the chunks into a
+# partial summary on request, only the counts are written to the database
+partial_summaries: Dict[str, dict] = {}
+
+def publish_done(process_id: str, error: Optional[str] = None):
+    """Tell /events subscribers that processing reached a terminal state"""
+    if error is None:
+        process_events.publish(process_id, "done", '{"status":"completed"}')
+    else:
+        process_events.publish(process_id, "done", json.dumps({"status": "error", "error": error}))
+
 # New meeting management endpoints
 @app.get("/get-meetings", response_model=List[MeetingResponse])
 async def get_meetings():
     """Get all meetings with their basic information"""
     try:
-        meetings = await db.get_all_meetings()
-        return [{"id": meeting["id"], "title": meeting["title"]} for meeting in meetings]
+        # Rows already match MeetingResponse; returning a response directly skips
+        # re-validating them, response_model is kept for the OpenAPI schema
+        return FastJSONResponse([{"id": meeting["id"], "title": meeting["title"]} async for meeting in db.iter_meetings()])
     except Exception as e:
         logger.error(f"Error getting meetings: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -180,7 +301,7 @@ async def get_meeting(meeting_id: str):
         meeting = await db.get_meeting(meeting_id)
         if not meeting:
             raise HTTPException(status_code=404, detail="Meeting not found")
-        return meeting
+        return FastJSONResponse(meeting)
     except HTTPException:
         raise
     except Exception as e:
@@ -213,55 +334,47 @@ async def delete_meeting(data: DeleteMeetingRequest):
 async def process_transcript_background(process_id: str, transcript: TranscriptRequest):
     """Background task to process transcript"""
     try:
-        logger.info(f"Starting background processing for process_id: {process_id}")
+        logger.info("Starting background processing for process_id: %s", process_id)
+
+        # Chunk summaries parsed as they complete, keyed by chunk index
+        parsed_chunks = {}
+        partial = partial_summaries[process_id] = {"chunks": parsed_chunks, "chunks_total": None}
+
+        async def on_chunk(i: int, num_chunks: int, chunk_summary: dict):
+            parsed_chunks[i] = parse_chunk_summary(process_id, chunk_summary)
+            partial["chunks_total"] = num_chunks
+            await processor.db.update_process(
+                process_id,
+                status="PROCESSING",
+                chunk_count=len(parsed_chunks),
+                metadata={"chunks_total": num_chunks}
+            )
+            # Only encode the event when someone is listening
+            if process_events.has_subscribers(process_id):
+                event = {"index": i, "chunks_done": len(parsed_chunks), "chunks_total": num_chunks, "summary": chunk_summary}
+                process_events.publish(process_id, "chunk", json_dumps_bytes(event).decode())
 
         num_chunks, all_json_data = await processor.process_transcript(
             text=transcript.text,
             model=transcript.model,
             model_name=transcript.model_name,
             chunk_size=transcript.chunk_size,
-            overlap=transcript.overlap
+            overlap=transcript.overlap,
+            on_chunk=on_chunk
         )
 
-        # Create final summary structure by aggregating chunk results
-        final_summary = {
-            "MeetingName": "",
-            "SectionSummary": {"title": "Section Summary", "blocks": []},
-            "CriticalDeadlines": {"title": "Critical Deadlines", "blocks": []},
-            "KeyItemsDecisions": {"title": "Key Items & Decisions", "blocks": []},
-            "ImmediateActionItems": {"title": "Immediate Action Items", "blocks": []},
-            "NextSteps": {"title": "Next Steps", "blocks": []},
-            "OtherImportantPoints": {"title": "Other Important Points", "blocks": []},
-            "ClosingRemarks": {"title": "Closing Remarks", "blocks": []}
-        }
-
-        # Process each chunk's data
-        for json_str in all_json_data:
-            try:
-                json_dict = json.loads(json_str)
-                if "MeetingName" in json_dict and json_dict["MeetingName"]:
-                    final_summary["MeetingName"] = json_dict["MeetingName"]
-                for key in final_summary:
-                    if key != "MeetingName" and key in json_dict and isinstance(json_dict[key], dict) and "blocks" in json_dict[key]:
-                        if isinstance(json_dict[key]["blocks"], list):
-                            final_summary[key]["blocks"].extend(json_dict[key]["blocks"])
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON chunk for {process_id}: {e}. Chunk: {json_str[:100]}...")
-            except Exception as e:
-                logger.error(f"Error processing chunk data for {process_id}: {e}. Chunk: {json_str[:100]}...")
+        final_summary = build_final_summary(parsed_chunks[i] for i in sorted(parsed_chunks))
 
-        # Update database with meeting name using meeting_id
-        if final_summary["MeetingName"]:
-            await processor.db.update_meeting_name(transcript.meeting_id, final_summary["MeetingName"])
-
-        # Save final result
+        # Save final result and the meeting name together
         if all_json_data:
-            await processor.db.update_process(process_id, status="completed", result=json.dumps(final_summary))
-            logger.info(f"Background processing completed for process_id: {process_id}")
+            await processor.db.finalize_process(process_id, final_summary, final_summary["MeetingName"])
+            publish_done(process_id)
+            logger.info("Background processing completed for process_id: %s", process_id)
         else:
             error_msg = "Summary generation failed: No summary could be generated. Please check your model/API key settings."
             await processor.db.update_process(process_id, status="failed", error=error_msg)
-            logger.error(f"Background processing failed for process_id: {process_id} - {error_msg}")
+            publish_done(process_id, error_msg)
+            logger.error("Background processing failed for process_id: %s - %s", process_id, error_msg)
 
     except Exception as e:
         error_msg = str(e)
@@ -270,6 +383,9 @@ async def process_transcript_background(process_id: str, transcript: TranscriptR
             await processor.db.update_process(process_id, status="failed", error=error_msg)
         except Exception as db_e:
             logger.error(f"Failed to update DB status to failed for {process_id}: {db_e}", exc_info=True)
+        publish_done(process_id, error_msg)
+    finally:
+        partial_summaries.pop(process_id, None)
 
 @app.post("/process-transcript")
 async def process_transcript_api(
@@ -277,6 +393,13 @@ async def process_transcript_api(
     background_tasks: BackgroundTasks
 ):
     """Process a transcript text with background processing"""
+    # Reject an unknown provider or a missing API key before anything is stored;
+    # the agent built here is cached and reused by the background task
+    try:
+        await processor.transcript_processor.get_agent(transcript.model, transcript.model_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         # Create new process linked to meeting_id
         process_id = await processor.db.create_process(transcript.meeting_id)
@@ -332,11 +455,7 @@ async def get_summary(meeting_id: str):
         summary_data = None
         if result.get("result"):
             try:
-                parsed_result = json.loads(result["result"])
-                if isinstance(parsed_result, str):
-                    summary_data = json.loads(parsed_result)
-                else:
-                    summary_data = parsed_result
+                summary_data = json_loads(result["result"])
                 if not isinstance(summary_data, dict):
                     logger.error(f"Parsed summary data is not a dictionary for meeting {meeting_id}")
                     summary_data = None
@@ -366,7 +485,22 @@ async def get_summary(meeting_id: str):
             return JSONResponse(status_code=400, content=response)
 
         elif status in ["processing", "pending", "started"]:
-            response["data"] = None
+            # Partial summary of the chunks finished so far, if any
+            partial = partial_summaries.get(meeting_id)
+            if partial is not None:
+                parsed_chunks = partial["chunks"]
+                if parsed_chunks:
+                    summary_data = build_final_summary(parsed_chunks[i] for i in sorted(parsed_chunks))
+                    response["meetingName"] = summary_data.get("MeetingName")
+                progress = {"chunks_done": len(parsed_chunks), "chunks_total": partial["chunks_total"]}
+            else:
+                # Processed by another worker or before a restart; only the stored counts are known
+                progress = {
+                    "chunks_done": result.get("chunk_count") or 0,
+                    "chunks_total": read_chunks_total(result.get("metadata"))
+                }
+            response["data"] = summary_data
+            response["progress"] = progress
             return JSONResponse(status_code=202, content=response)
 
         elif status == "completed":
@@ -376,7 +510,14 @@ async def get_summary(meeting_id: str):
                 response["data"] = None
                 response["meetingName"] = None
                 return JSONResponse(status_code=500, content=response)
-            return JSONResponse(status_code=200, content=response)
+            # The stored result is already the serialized summary; splice it in
+            # as the trailing "data" member instead of encoding the dict again
+            stored = result["result"]
+            if isinstance(stored, str):
+                stored = stored.encode()
+            del response["data"]
+            body = json_dumps_bytes(response)[:-1] + b',"data":' + stored + b"}"
+            return Response(content=body, status_code=200, media_type="application/json")
 
         else:
             response["status"] = "error"
@@ -400,29 +541,61 @@ async def get_summary(meeting_id: str):
             }
         )
 
+@app.get("/events/{meeting_id}")
+async def summary_events(meeting_id: str):
+    """Server-sent events for a summary process: one 'chunk' event per finished
+    chunk, then a single 'done' event; fetch /get-summary afterwards for the result"""
+    # Subscribe before reading the status so a completion in between is not missed
+    queue = process_events.subscribe(meeting_id)
+    try:
+        result = await processor.db.get_transcript_data(meeting_id)
+    except Exception:
+        process_events.unsubscribe(meeting_id, queue)
+        raise
+    if not result:
+        process_events.unsubscribe(meeting_id, queue)
+        raise HTTPException(status_code=404, detail="Meeting ID not found")
+
+    status = (result.get("status") or "").upper()
+
+    async def stream():
+        try:
+            if status == "COMPLETED":
+                yield 'event: done\ndata: {"status":"completed"}\n\n'
+                return
+            if status == "FAILED":
+                yield f"event: done\ndata: {json.dumps({'status': 'error', 'error': result.get('error')})}\n\n"
+                return
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield message
+                if message.startswith("event: done"):
+                    return
+        finally:
+            process_events.unsubscribe(meeting_id, queue)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.post("/save-transcript")
 async def save_transcript(request: SaveTranscriptRequest):
     """Save transcript segments for a meeting without processing"""
     try:
-        logger.info(f"Received save-transcript request for meeting: {request.meeting_title}")
-        logger.info(f"Number of transcripts to save: {len(request.transcripts)}")
+        logger.info("Received save-transcript request for meeting: %s", request.meeting_title)
+        logger.info("Number of transcripts to save: %d", len(request.transcripts))
 
         # Generate a unique meeting ID
         meeting_id = f"meeting-{int(time.time() * 1000)}"
 
-        # Save the meeting
-        await db.save_meeting(meeting_id, request.meeting_title)
-
-        # Save each transcript segment
-        for transcript in request.transcripts:
-            await db.save_meeting_transcript(
-                meeting_id=meeting_id,
-                transcript=transcript.text,
-                timestamp=transcript.timestamp,
-                summary="",
-                action_items="",
-                key_points=""
-            )
+        # Save the meeting and all its transcript segments in a single transaction
+        await db.save_meeting_with_transcripts(
+            meeting_id,
+            request.meeting_title,
+            ((transcript.text, transcript.timestamp, "", "", "") for transcript in request.transcripts)
+        )
 
         logger.info("Transcripts saved successfully")
         return {"status": "success", "message": "Transcript saved successfully", "meeting_id": meeting_id}
@@ -475,6 +648,7 @@ async def shutdown_event():
     logger.info("API shutting down, cleaning up resources")
     try:
         processor.cleanup()
+        await DatabaseManager.close_all()
         logger.info("Successfully cleaned up resources")
     except Exception as e:
         logger.error(f"Error during cleanup: {str(e)}", exc_info=True)
@@ -1,29 +1,220 @@
 from pydantic import BaseModel
-from typing import List, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Optional
 from pydantic_ai import Agent
 from pydantic_ai.models.anthropic import AnthropicModel
 from pydantic_ai.models.ollama import OllamaModel
 from pydantic_ai.models.groq import GroqModel
 from pydantic_ai.models.openai import OpenAIModel
+import asyncio
+import hashlib
 import logging
 import os
+import random
+import time
 from dotenv import load_dotenv
 from db import DatabaseManager
 
+# Handlers and levels are configured by the application entry point (main.py)
+logger = logging.getLogger(__name__)
 
+load_dotenv()  # Load environment variables from .env file
 
+db = DatabaseManager()
 
+# Upper bound on chunk summaries requested from the LLM at the same time,
+# tunable per deployment to stay within provider rate limits
+MAX_CONCURRENT_CHUNKS = max(1, int(os.getenv("TRANSCRIPT_MAX_CONCURRENCY", "8")))
+# Chunks packed into a single LLM request by default; raise it for
+# large-context models to save round trips and per-request rate limit
+MARSHAL_BATCH = max(1, int(os.getenv("TRANSCRIPT_MARSHAL_BATCH", "1")))
 
-# Set up logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
-)
-logger = logging.getLogger(__name__)
+# Reuse stored chunk summaries for identical chunk text; TRANSCRIPT_SUMMARY_CACHE=off disables it
+SUMMARY_CACHE_ENABLED = os.getenv("TRANSCRIPT_SUMMARY_CACHE", "on").lower() not in ("off", "0", "false")
 
-load_dotenv()  # Load environment variables from .env file
+# Part of every cache key; bump it whenever the prompts or SummaryResponse change
+# so summaries produced by the old ones are no longer served
+SUMMARY_CACHE_VERSION = 1
 
-db = DatabaseManager()
+def summary_cache_key(model: str, model_name: str, chunks: List[str], batched: bool = False) -> str:
+    """SHA-256 over the cache version, provider, model and chunk texts of one LLM request"""
+    digest = hashlib.sha256(f"{SUMMARY_CACHE_VERSION}\0{model}\0{model_name}\0{'batch' if batched else 'chunk'}".encode())
+    for chunk in chunks:
+        digest.update(b"\0")
+        digest.update(chunk.encode())
+    return digest.hexdigest()
+
+# The cache only saves LLM calls, so its errors are logged and never fail a chunk
+
+async def get_cached_summary(key: str) -> Any:
+    """Cached summary for a key, or None on a miss or a failed lookup"""
+    try:
+        return await db.get_cached_summary(key)
+    except Exception as e:
+        logger.warning("Summary cache lookup failed, treating it as a miss: %s", e)
+        return None
+
+async def cache_summary(key: str, summary: Any):
+    """Store a summary in the cache, ignoring failures"""
+    try:
+        await db.cache_summary(key, summary)
+    except Exception as e:
+        logger.warning("Failed to store summary in cache: %s", e)
+
+# Providers that need an API key, with the setting named in the error when it is missing
+API_KEY_NAMES = {
+    "claude": "ANTHROPIC_API_KEY",
+    "groq": "GROQ_API_KEY",
+    "openai": "OPENAI_API_KEY",
+}
+
+# Default (requests, tokens) per minute for each provider, overridable with
+# <PROVIDER>_RPM / <PROVIDER>_TPM; None or 0 means no limit
+DEFAULT_RATE_LIMITS = {
+    "claude": (50, 40000),
+    "groq": (30, None),
+    "openai": (None, None),
+    "ollama": (None, None),
+}
+# Tokens budgeted per request on top of the chunk: instructions plus the summary
+PROMPT_OVERHEAD_TOKENS = 500
+
+def estimate_tokens(chunk: str) -> int:
+    """Rough token count of a chunk request, at about four characters per token"""
+    return len(chunk) // 4 + PROMPT_OVERHEAD_TOKENS
+
+class TokenBucket:
+    """Bucket holding up to one minute's allowance, refilled continuously"""
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be taken, 0 if available now"""
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+class RateLimiter:
+    """Proactive requests/tokens per minute limiter shared by all calls to one provider.
+
+    Requests wait until both buckets have room instead of being sent and
+    retried after a 429.
+    """
+    def __init__(self, rpm: Optional[int], tpm: Optional[int]):
+        self.buckets = [(TokenBucket(rpm), False)] if rpm else []
+        if tpm:
+            self.buckets.append((TokenBucket(tpm), True))
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int):
+        """Wait until one request of the given token estimate fits in every bucket"""
+        # The lock keeps waiters in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = 0.0
+                for bucket, counts_tokens in self.buckets:
+                    bucket.refill(now)
+                    wait = max(wait, bucket.wait_time(tokens if counts_tokens else 1))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            for bucket, counts_tokens in self.buckets:
+                bucket.take(tokens if counts_tokens else 1)
+
+_rate_limiters: Dict[str, Optional[RateLimiter]] = {}
+
+def _env_limit(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+def get_rate_limiter(provider: str) -> Optional[RateLimiter]:
+    """Process-wide limiter for a provider, or None when it is unlimited"""
+    if provider not in _rate_limiters:
+        rpm, tpm = DEFAULT_RATE_LIMITS.get(provider, (None, None))
+        rpm = _env_limit(f"{provider.upper()}_RPM", rpm)
+        tpm = _env_limit(f"{provider.upper()}_TPM", tpm)
+        _rate_limiters[provider] = RateLimiter(rpm, tpm) if rpm or tpm else None
+    return _rate_limiters[provider]
+
+# Provider responses that mean "slow down": rate limited, or overloaded (Anthropic 529)
+RETRYABLE_STATUS_CODES = frozenset({429, 503, 529})
+# Retries of a throttled request before its chunks are given up, with full-jitter
+# exponential backoff between them; a Retry-After header takes precedence
+RATE_LIMIT_RETRIES = max(0, int(os.getenv("TRANSCRIPT_RATE_LIMIT_RETRIES", "5")))
+RATE_LIMIT_BACKOFF_BASE = 1.0
+RATE_LIMIT_BACKOFF_MAX = 60.0
+
+def retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying a throttled request"""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), RATE_LIMIT_BACKOFF_MAX)
+        except ValueError:
+            pass  # An HTTP date; fall back to backoff
+    return random.uniform(0, min(RATE_LIMIT_BACKOFF_MAX, RATE_LIMIT_BACKOFF_BASE * 2 ** attempt))
+
+async def run_with_backoff(agent: Agent, prompt: str, label: str):
+    """agent.run, retried with backoff while the provider throttles the request.
+
+    result_retries only covers result validation; provider errors raise
+    straight out of agent.run.
+    """
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            return await agent.run(prompt)
+        except Exception as e:
+            # The provider SDKs (anthropic, openai, groq) expose the HTTP status as status_code
+            if getattr(e, "status_code", None) not in RETRYABLE_STATUS_CODES or attempt == RATE_LIMIT_RETRIES:
+                raise
+            delay = retry_delay(e, attempt)
+            logger.warning("Provider throttled chunks %s (%s), retry %d/%d in %.1fs",
+                           label, e.status_code, attempt + 1, RATE_LIMIT_RETRIES, delay)
+            await asyncio.sleep(delay)
+
+def chunk_offsets(length: int, chunk_size: int, step: int) -> List[Tuple[int, int]]:
+    """(start, end) offsets of each chunk, stopping at the first chunk that reaches the end of the text.
+
+    Windows starting after that point would lie entirely inside the overlap of
+    the previous chunk and only cost extra LLM calls.
+    """
+    offsets = []
+    for start in range(0, length, step):
+        end = start + chunk_size
+        offsets.append((start, min(end, length)))
+        if end >= length:
+            break
+    return offsets
+
+# Constant parts of the summarization prompts, built once; per request only the
+# chunk text is put between them
+CHUNK_PROMPT_PREFIX = (
+    "Given the following meeting transcript chunk, extract the relevant information according to the required JSON structure. "
+    "If a specific section (like Critical Deadlines) has no relevant information in this chunk, return an empty list for its 'blocks'. "
+    "Ensure the output is only the JSON data.\n"
+    "\n"
+    "Transcript Chunk:\n"
+    "---\n"
+)
+CHUNK_PROMPT_SUFFIX = "\n---\n"
+BATCH_PROMPT_PREFIX = (
+    "Given the following {count} meeting transcript chunks, extract the relevant information from each chunk separately according to the required JSON structure. "
+    "Return a JSON array with exactly one summary per chunk, in chunk order. "
+    "If a specific section (like Critical Deadlines) has no relevant information in a chunk, return an empty list for its 'blocks'. "
+    "Ensure the output is only the JSON data.\n"
+    "\n"
+)
+BATCH_PROMPT_SUFFIX = "=== END ===\n"
 
 class Block(BaseModel):
     """Represents a block of content in a section"""
@@ -56,7 +247,61 @@ class TranscriptProcessor:
         """Initialize the transcript processor."""
         logger.info("TranscriptProcessor initialized.")
         self.db = DatabaseManager()
-    async def process_transcript(self, text: str, model: str, model_name: str, chunk_size: int = 5000, overlap: int = 1000) -> Tuple[int, List[str]]:
+        # Agents keyed by (provider, model name, API key, batched) so repeat
+        # requests skip client construction and result schema setup; the key
+        # is part of the cache key so a rotated key takes effect immediately
+        self._agent_cache: Dict[Tuple[str, str, Optional[str], bool], Agent] = {}
+        self._agent_lock = asyncio.Lock()
+
+    async def get_agent(self, model: str, model_name: str, batched: bool = False) -> Agent:
+        """Return the cached agent for a provider/model, building it on first use."""
+        api_key = await db.get_api_key(model) if model in API_KEY_NAMES else None
+        key = (model, model_name, api_key, batched)
+        async with self._agent_lock:
+            agent = self._agent_cache.get(key)
+            if agent is None:
+                agent = Agent(
+                    self._build_llm(model, model_name, api_key),
+                    result_type=List[SummaryResponse] if batched else SummaryResponse,
+                    result_retries=5,
+                )
+                self._agent_cache[key] = agent
+                logger.info("Pydantic-AI Agent initialized.")
+            return agent
+
+    @staticmethod
+    def _build_llm(model: str, model_name: str, api_key: Optional[str]):
+        """Select and initialize the AI model for a provider"""
+        if model in API_KEY_NAMES and not api_key:
+            raise ValueError(f"{API_KEY_NAMES[model]} environment variable not set")
+        if model == "claude":
+            logger.info(f"Using Claude model: {model_name}")
+            return AnthropicModel(model_name, api_key=api_key)
+        elif model == "ollama":
+            # Assumes Ollama server is running locally at default address
+            # You might need host/port configuration if it's elsewhere
+            logger.info(f"Using Ollama model: {model_name}")
+            return OllamaModel(model_name)
+        elif model == "groq":
+            logger.info(f"Using Groq model: {model_name}")
+            return GroqModel(model_name, api_key=api_key)
+        elif model == "openai":
+            logger.info(f"Using OpenAI model: {model_name}")
+            return OpenAIModel(model_name, api_key=api_key)
+        else:
+            logger.error(f"Unsupported model provider requested: {model}")
+            raise ValueError(f"Unsupported model provider: {model}")
+
+    def cleanup(self):
+        """Drop cached agents."""
+        # The SDK clients share pydantic-ai's process-wide httpx client, so
+        # there are no per-agent connections to close here
+        self._agent_cache.clear()
+        logger.info("TranscriptProcessor agent cache cleared.")
+
+    async def process_transcript(self, text: str, model: str, model_name: str, chunk_size: int = 5000, overlap: int = 1000,
+                                 marshal_batch: Optional[int] = None,
+                                 on_chunk: Optional[Callable[[int, int, Dict[str, Any]], Awaitable[None]]] = None) -> Tuple[int, List[Dict[str, Any]]]:
         """
         Process transcript text into chunks and generate structured summaries for each chunk using an AI model.
 
@@ -66,54 +311,23 @@ class TranscriptProcessor:
             model_name: The specific model name.
             chunk_size: The size of each text chunk.
             overlap: The overlap between consecutive chunks.
+            marshal_batch: Chunks summarized per LLM request (default MARSHAL_BATCH).
+            on_chunk: Awaited with (chunk index, number of chunks, summary) as each
+                chunk summary completes, in completion order.
 
         Returns:
             A tuple containing:
             - The number of chunks processed.
-            - A list of JSON strings, where each string is the summary of a chunk.
+            - A list of JSON-compatible dicts, each the summary of a chunk.
         """
 
-        logger.info(f"Processing transcript (length {len(text)}) with model provider={model}, model_name={model_name}, chunk_size={chunk_size}, overlap={overlap}")
+        logger.info("Processing transcript (length %d) with model provider=%s, model_name=%s, chunk_size=%d, overlap=%d",
+                    len(text), model, model_name, chunk_size, overlap)
 
         all_json_data = []
-        agent = None # Define agent variable
-        llm = None # Define llm variable
 
         try:
-            # Select and initialize the AI model and agent
-            if model == "claude":
-                api_key = await db.get_api_key("claude")
-                if not api_key: raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-                llm = AnthropicModel(model_name, api_key=api_key)
-                logger.info(f"Using Claude model: {model_name}")
-            elif model == "ollama":
-                # Assumes Ollama server is running locally at default address
-                # You might need host/port configuration if it's elsewhere
-                llm = OllamaModel(model_name)
-                logger.info(f"Using Ollama model: {model_name}")
-            elif model == "groq":
-                api_key = await db.get_api_key("groq")
-                if not api_key: raise ValueError("GROQ_API_KEY environment variable not set")
-                llm = GroqModel(model_name, api_key=api_key)
-                logger.info(f"Using Groq model: {model_name}")
-            # --- ADD OPENAI SUPPORT HERE ---
-            elif model == "openai":
-                api_key = await db.get_api_key("openai")
-                if not api_key: raise ValueError("OPENAI_API_KEY environment variable not set")
-                llm = OpenAIModel(model_name, api_key=api_key)
-                logger.info(f"Using OpenAI model: {model_name}")
-            # --- END OPENAI SUPPORT ---
-            else:
-                logger.error(f"Unsupported model provider requested: {model}")
-                raise ValueError(f"Unsupported model provider: {model}")
-
-            # Initialize the agent with the selected LLM
-            agent = Agent(
-                llm,
-                result_type=SummaryResponse,
-                result_retries=5,
-            )
-            logger.info("Pydantic-AI Agent initialized.")
+            agent = await self.get_agent(model, model_name)
 
             # Split transcript into chunks
             step = chunk_size - overlap
@@ -122,43 +336,131 @@ class TranscriptProcessor:
                 overlap = max(0, chunk_size - 100)
                 step = chunk_size - overlap
 
-            chunks = [text[i:i+chunk_size] for i in range(0, len(text), step)]
-            num_chunks = len(chunks)
-            logger.info(f"Split transcript into {num_chunks} chunks.")
+            # Only offsets are kept up front; each chunk is sliced once its request
+            # is admitted, so only the chunks of in-flight requests are held in memory
+            offsets = chunk_offsets(len(text), chunk_size, step)
+            num_chunks = len(offsets)
+            logger.info("Split transcript into %d chunks.", num_chunks)
+
+            # Chunks are independent, so their LLM calls run concurrently;
+            # gather keeps the results in chunk order
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+            limiter = get_rate_limiter(model)
 
-            for i, chunk in enumerate(chunks):
-                logger.info(f"Processing chunk {i+1}/{num_chunks}...")
+            marshal_batch = max(1, marshal_batch or MARSHAL_BATCH)
+
+            async def report(i: int, chunk_json: Dict[str, Any]):
+                # Hand each summary to the caller as soon as it is ready,
+                # outside the semaphore so a slow callback holds no LLM slot
+                if on_chunk is None:
+                    return
                 try:
-                    # Run the agent to get the structured summary for the chunk
-                    summary_result = await agent.run(
-                        f"""Given the following meeting transcript chunk, extract the relevant information according to the required JSON structure. If a specific section (like Critical Deadlines) has no relevant information in this chunk, return an empty list for its 'blocks'. Ensure the output is only the JSON data.
-
-                        Transcript Chunk:
-                        ---
-                        {chunk}
-                        ---
-                        """,
-                    )
-
-                    if hasattr(summary_result, 'data') and isinstance(summary_result.data, SummaryResponse):
-                         final_summary_pydantic = summary_result.data
-                    elif isinstance(summary_result, SummaryResponse):
-                         final_summary_pydantic = summary_result
-                    else:
-                         logger.error(f"Unexpected result type from agent for chunk {i+1}: {type(summary_result)}")
-                         continue # Skip this chunk
-
-                    # Convert the Pydantic model to a JSON string
-                    chunk_summary_json = final_summary_pydantic.model_dump_json()
-                    all_json_data.append(chunk_summary_json)
-                    logger.info(f"Successfully generated summary for chunk {i+1}.")
-
-                except Exception as chunk_error:
-                    logger.error(f"Error processing chunk {i+1}: {chunk_error}", exc_info=True)
-
-            logger.info(f"Finished processing all {num_chunks} chunks.")
+                    await on_chunk(i, num_chunks, chunk_json)
+                except Exception as callback_error:
+                    logger.error("on_chunk callback failed for chunk %d: %s", i + 1, callback_error, exc_info=True)
+
+            if marshal_batch > 1:
+                batch_agent = await self.get_agent(model, model_name, batched=True)
+
+                async def run_batch(first: int) -> List[Dict[str, Any]]:
+                    async with semaphore:
+                        batch = [text[start:end] for start, end in offsets[first:first + marshal_batch]]
+                        cache_key = summary_cache_key(model, model_name, batch, batched=True) if SUMMARY_CACHE_ENABLED else None
+                        cached = await get_cached_summary(cache_key) if cache_key is not None else None
+                        # Rows written before summaries were stored as dicts are treated as misses
+                        if isinstance(cached, list) and len(cached) == len(batch) and all(isinstance(c, dict) for c in cached):
+                            logger.info("Using cached summaries for chunks %d-%d/%d", first + 1, first + len(batch), num_chunks)
+                            batch_json = cached
+                        else:
+                            if limiter is not None:
+                                await limiter.acquire(sum(estimate_tokens(chunk) for chunk in batch))
+                            batch_json = await self.process_chunk_batch(batch_agent, batch, first, num_chunks)
+                            if cache_key is not None and batch_json:
+                                await cache_summary(cache_key, batch_json)
+                    for offset, chunk_json in enumerate(batch_json):
+                        await report(first + offset, chunk_json)
+                    return batch_json
+
+                starts = range(0, num_chunks, marshal_batch)
+                results = await asyncio.gather(*(run_batch(first) for first in starts))
+                all_json_data = [chunk_json for batch_json in results for chunk_json in batch_json]
+            else:
+                async def run_chunk(i: int, start: int, end: int) -> Optional[Dict[str, Any]]:
+                    async with semaphore:
+                        chunk = text[start:end]
+                        cache_key = summary_cache_key(model, model_name, [chunk]) if SUMMARY_CACHE_ENABLED else None
+                        chunk_json = await get_cached_summary(cache_key) if cache_key is not None else None
+                        if isinstance(chunk_json, dict):
+                            logger.info("Using cached summary for chunk %d/%d", i + 1, num_chunks)
+                        else:
+                            if limiter is not None:
+                                await limiter.acquire(estimate_tokens(chunk))
+                            chunk_json = await self.process_chunk(agent, chunk, i, num_chunks)
+                            if cache_key is not None and chunk_json is not None:
+                                await cache_summary(cache_key, chunk_json)
+                    if chunk_json is not None:
+                        await report(i, chunk_json)
+                    return chunk_json
+
+                results = await asyncio.gather(*(run_chunk(i, start, end) for i, (start, end) in enumerate(offsets)))
+                all_json_data = [chunk_json for chunk_json in results if chunk_json is not None]
+
+            logger.info("Finished processing all %d chunks.", num_chunks)
             return num_chunks, all_json_data
 
         except Exception as e:
             logger.error(f"Error during transcript processing: {str(e)}", exc_info=True)
-            raise
\ No newline at end of file
+            raise
+
+    async def process_chunk(self, agent: Agent, chunk: str, i: int, num_chunks: int) -> Optional[Dict[str, Any]]:
+        """Summarize a single chunk, returning its summary dict or None if it failed."""
+        logger.info("Processing chunk %d/%d...", i + 1, num_chunks)
+        try:
+            # Run the agent to get the structured summary for the chunk
+            summary_result = await run_with_backoff(agent, CHUNK_PROMPT_PREFIX + chunk + CHUNK_PROMPT_SUFFIX, f"{i+1}/{num_chunks}")
+
+            if hasattr(summary_result, 'data') and isinstance(summary_result.data, SummaryResponse):
+                 final_summary_pydantic = summary_result.data
+            elif isinstance(summary_result, SummaryResponse):
+                 final_summary_pydantic = summary_result
+            else:
+                 logger.error("Unexpected result type from agent for chunk %d: %s", i + 1, type(summary_result))
+                 return None # Skip this chunk
+
+            # Plain JSON-compatible data; it is encoded once, where it is stored
+            chunk_summary = final_summary_pydantic.model_dump(mode="json")
+            logger.info("Successfully generated summary for chunk %d.", i + 1)
+            return chunk_summary
+
+        except Exception as chunk_error:
+            logger.error("Error processing chunk %d: %s", i + 1, chunk_error, exc_info=True)
+            return None
+
+    async def process_chunk_batch(self, agent: Agent, batch: List[str], first: int, num_chunks: int) -> List[Dict[str, Any]]:
+        """Summarize several chunks in one request, returning their summary dicts or an empty list if it failed."""
+        label = f"{first+1}-{first+len(batch)}/{num_chunks}"
+        logger.info("Processing chunks %s in one request...", label)
+        parts = [BATCH_PROMPT_PREFIX.format(count=len(batch))]
+        for k, chunk in enumerate(batch, start=1):
+            parts.append(f"=== CHUNK {k} ===\n")
+            parts.append(chunk)
+            parts.append("\n")
+        parts.append(BATCH_PROMPT_SUFFIX)
+        try:
+            summary_result = await run_with_backoff(agent, "".join(parts), label)
+
+            summaries = getattr(summary_result, 'data', None)
+            if not isinstance(summaries, list):
+                logger.error("Unexpected result type from agent for chunks %s: %s", label, type(summaries))
+                return []
+            if len(summaries) != len(batch):
+                # Summaries can't be matched to chunks, so the batch counts as failed
+                logger.error("Expected %d summaries for chunks %s, got %d", len(batch), label, len(summaries))
+                return []
+
+            logger.info("Successfully generated summaries for chunks %s.", label)
+            return [summary.model_dump(mode="json") for summary in summaries]
+
+        except Exception as batch_error:
+            logger.error("Error processing chunks %s: %s", label, batch_error, exc_info=True)
+            return []
\ No newline at end of file
@@ -1,5 +1,5 @@
-import requests
-import time
+import asyncio
+import httpx
 import argparse
 import json
 import sys
@@ -15,15 +15,21 @@ DEFAULT_OVERLAP = 1000
 DEFAULT_POLL_INTERVAL_SECONDS = 5  # How often to check the status
 DEFAULT_MAX_POLL_ATTEMPTS = 24     # Max times to poll (e.g., 24 * 5s = 120s timeout)
 
+try:
+    import h2  # noqa: F401  httpx only negotiates HTTP/2 when h2 is installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Configure basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # --- API Interaction Functions ---
 
-def process_transcript(base_url, transcript_text, provider, model_name, chunk_size, overlap, meeting_id):
+async def process_transcript(client, transcript_text, provider, model_name, chunk_size, overlap, meeting_id):
     """Sends the transcript to the processing endpoint."""
-    url = f"{base_url}/process-transcript"
+    url = "/process-transcript"
     payload = {
         "text": transcript_text,
         "model": provider,
@@ -37,7 +43,7 @@ def process_transcript(base_url, transcript_text, provider, model_name, chunk_si
     logger.debug(f"Payload: {json.dumps(payload, indent=2)}") # Log payload for debugging if needed
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30) # 30s timeout for initial request
+        response = await client.post(url, headers=headers, json=payload, timeout=30) # 30s timeout for initial request
         logger.info(f"POST Response Status Code: {response.status_code}")
         response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
 
@@ -54,28 +60,28 @@ def process_transcript(base_url, transcript_text, provider, model_name, chunk_si
             logger.error(f"'process_id' not found in response: {response_data}")
             return None
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error(f"Error: Request to {url} timed out.")
         return None
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error during transcript processing request: {e}")
-        if e.response is not None:
+        if isinstance(e, httpx.HTTPStatusError):
              logger.error(f"Response status: {e.response.status_code}, Response text: {e.response.text}")
         return None
     except json.JSONDecodeError:
         logger.error(f"Could not decode JSON response from {url}. Response text: {response.text}")
         return None
 
-def poll_summary_status(base_url, meeting_id_for_polling, interval, max_attempts):
+async def poll_summary_status(client, meeting_id_for_polling, interval, max_attempts):
     """Polls the summary status endpoint until completion or error, using meeting_id."""
     # *** UPDATED endpoint path ***
-    url = f"{base_url}/get-summary/{meeting_id_for_polling}"
+    url = f"/get-summary/{meeting_id_for_polling}"
     logger.info(f"Polling status endpoint: {url} (every {interval}s) for meeting_id '{meeting_id_for_polling}'")
 
     for attempt in range(max_attempts):
         logger.info(f"Polling attempt {attempt + 1}/{max_attempts}...")
         try:
-            response = requests.get(url, timeout=20) # 20s timeout for polling request
+            response = await client.get(url, timeout=20) # 20s timeout for polling request
             logger.info(f"GET Response Status Code: {response.status_code}")
 
             # Check for non-blocking statuses first (202 indicates processing)
@@ -83,7 +89,14 @@ def poll_summary_status(base_url, meeting_id_for_polling, interval, max_attempts
                 status_data = response.json()
                 status = status_data.get("status", "processing").lower() # Assume processing if status missing
                 logger.info(f"  Status: {status} (via 202 Accepted)")
-                time.sleep(interval)
+                progress = status_data.get("progress") or {}
+                if progress.get("chunks_total"):
+                    logger.info(f"  Progress: {progress.get('chunks_done', 0)}/{progress['chunks_total']} chunks summarized")
+                partial_data = status_data.get("data")
+                if partial_data:
+                    # Summary of the chunks finished so far; the final result replaces it
+                    logger.info(f"  Partial summary: {json.dumps(partial_data)}")
+                await asyncio.sleep(interval)
                 continue # Go to next poll attempt
 
             response.raise_for_status() # Raise exception for other bad statuses (4xx, 5xx)
@@ -111,18 +124,18 @@ def poll_summary_status(base_url, meeting_id_for_polling, interval, max_attempts
                 return None
             elif status in ["processing", "pending", "started"]: # Backend might use these
                 # Wait before the next poll (already handled by 202 check, but keep for robustness)
-                time.sleep(interval)
+                await asyncio.sleep(interval)
             else:
                 logger.warning(f"Received unknown status '{status}'. Response: {status_data}. Continuing to poll.")
-                time.sleep(interval)
+                await asyncio.sleep(interval)
 
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.warning(f"Polling request timed out. Retrying...")
-            time.sleep(interval) # Wait before retrying after timeout
-        except requests.exceptions.RequestException as e:
+            await asyncio.sleep(interval) # Wait before retrying after timeout
+        except httpx.HTTPError as e:
             logger.error(f"Error during polling request: {e}. Stopping polling.")
-            if e.response is not None:
+            if isinstance(e, httpx.HTTPStatusError):
                 logger.error(f"Response status: {e.response.status_code}, Response text: {e.response.text}")
                 # Handle 404 specifically - means meeting ID wasn't found (maybe typo or processing failed early)
                 if e.response.status_code == 404:
@@ -136,6 +149,71 @@ def poll_summary_status(base_url, meeting_id_for_polling, interval, max_attempts
     logger.error(f"Reached maximum polling attempts ({max_attempts}) without completion.")
     return None
 
+async def wait_for_completion_events(client, meeting_id, max_wait):
+    """Follows the /events stream until the backend reports a terminal state.
+
+    Returns True once a 'done' event arrives, False if the stream is unavailable
+    or ends early, in which case the caller falls back to polling.
+    """
+    url = f"/events/{meeting_id}"
+    logger.info(f"Listening for progress events on {url}")
+
+    async def follow():
+        # Idle streams carry a keepalive comment every 15s, so a read timeout means a dead stream
+        async with client.stream("GET", url, timeout=httpx.Timeout(10, read=60)) as response:
+            if response.status_code != 200:
+                logger.warning(f"Events endpoint returned {response.status_code}, falling back to polling.")
+                return False
+            event = None
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:") and event:
+                    data = json.loads(line[len("data:"):])
+                    if event == "chunk":
+                        logger.info(f"  Chunk {data['index'] + 1} summarized ({data['chunks_done']}/{data['chunks_total']} done)")
+                    elif event == "done":
+                        logger.info(f"  Processing finished with status: {data.get('status')}")
+                        return True
+            return False
+
+    try:
+        return await asyncio.wait_for(follow(), timeout=max_wait)
+    except (httpx.HTTPError, json.JSONDecodeError, KeyError, asyncio.TimeoutError) as e:
+        logger.warning(f"Event stream unavailable ({e!r}), falling back to polling.")
+        return False
+
+async def run_workflow(args, transcript_content, meeting_id):
+    """Submits the transcript and waits for its summary over a single pooled client."""
+    async with httpx.AsyncClient(base_url=args.base_url, http2=HTTP2_AVAILABLE) as client:
+        # 2. Process Transcript (POST request)
+        # Pass the generated meeting_id
+        process_id_from_api = await process_transcript(
+            client,
+            transcript_content,
+            args.provider,
+            args.model_name,
+            args.chunk_size,
+            args.overlap,
+            meeting_id # Pass the generated ID
+        )
+
+        if not process_id_from_api:
+            logger.error("Failed to initiate transcript processing. Exiting.")
+            sys.exit(1)
+
+        # 3. Wait for completion via server-sent events, then fetch the summary;
+        # if the stream is unavailable, polling alone drives the wait
+        await wait_for_completion_events(client, process_id_from_api, args.interval * args.attempts)
+
+        # Use the process_id returned by the API (which is the meeting_id) for polling
+        return await poll_summary_status(
+            client,
+            process_id_from_api, # Use the ID received from the /process-transcript response
+            args.interval,
+            args.attempts
+        )
+
 # --- Main Execution ---
 
 if __name__ == "__main__":
@@ -174,30 +252,8 @@ if __name__ == "__main__":
     meeting_id = f"test-meeting-{uuid.uuid4()}" # Generate unique ID
     logger.info(f"Generated Meeting ID for this run: {meeting_id}")
 
-    # 2. Process Transcript (POST request)
-    # Pass the generated meeting_id
-    process_id_from_api = process_transcript(
-        args.base_url,
-        transcript_content,
-        args.provider,
-        args.model_name,
-        args.chunk_size,
-        args.overlap,
-        meeting_id # Pass the generated ID
-    )
-
-    if not process_id_from_api:
-        logger.error("Failed to initiate transcript processing. Exiting.")
-        sys.exit(1)
-
-    # 3. Poll for Summary (GET requests)
-    # Use the process_id returned by the API (which is the meeting_id) for polling
-    summary_result = poll_summary_status(
-        args.base_url,
-        process_id_from_api, # Use the ID received from the /process-transcript response
-        args.interval,
-        args.attempts
-    )
+    # 2. and 3. share one client so the POST and every poll reuse the same connection
+    summary_result = asyncio.run(run_workflow(args, transcript_content, meeting_id))
 
     # 4. Display Result
     if summary_result: